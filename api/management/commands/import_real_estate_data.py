@@ -1,9 +1,55 @@
+import csv
+import io
+import uuid
+from itertools import islice
+
+import numpy as np
+import pandas as pd
 from django.conf import settings
+from django.core.cache import cache
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models.base import ModelState
 
-from api.models import RealEstateData
+from api.models import CachedAnalysis, RealEstateData
+from api.utils import cache_keys
 from api.utils.data_processor import RealEstateDataProcessor
 
+BATCH_SIZE = 1000
+
+# Natural key of a RealEstateData row (matches Meta.unique_together).
+UNIQUE_FIELDS = ["final_location", "year", "city"]
+
+# NULL marker for COPY ... (FORMAT csv); keeps empty strings distinct from NULL.
+COPY_NULL = "\\N"
+
+
+def build_row_factory(model, field_names):
+    """Return ``make(values)`` building ``model`` instances from a tuple of values.
+
+    The function is generated once per import with a straight-line assignment per
+    concrete field, skipping ``Model.__init__``'s per-field setattr loop (and its
+    pre_init/post_init signals). ``values`` must follow ``field_names``; every
+    other concrete field gets its default, or None for auto fields.
+    """
+    namespace = {"model": model, "ModelState": ModelState}
+    lines = ["def make(values):", "    obj = model.__new__(model)", "    attrs = obj.__dict__"]
+    provided = {name: index for index, name in enumerate(field_names)}
+    for field in model._meta.concrete_fields:
+        if field.attname in provided:
+            value = f"values[{provided[field.attname]}]"
+        elif field.has_default() and callable(field.default):
+            namespace[f"default_{field.attname}"] = field.default
+            value = f"default_{field.attname}()"
+        else:
+            namespace[f"default_{field.attname}"] = field.get_default()
+            value = f"default_{field.attname}"
+        lines.append(f"    attrs[{field.attname!r}] = {value}")
+    lines += ["    obj._state = ModelState()", "    return obj"]
+
+    exec("\n".join(lines), namespace)
+    return namespace["make"]
+
 
 class Command(BaseCommand):
     help = "Import real estate data from the configured Excel/CSV file or Google Sheet into the database."
@@ -22,7 +68,10 @@ class Command(BaseCommand):
         parser.add_argument(
             "--truncate",
             action="store_true",
-            help="Remove existing RealEstateData records before importing.",
+            help=(
+                "Remove existing RealEstateData records before importing. Without it, rows "
+                "matching an existing (final_location, year, city) are updated in place."
+            ),
         )
 
     def handle(self, *args, **options):
@@ -39,15 +88,154 @@ class Command(BaseCommand):
         if df is None or df.empty:
             raise CommandError("No rows available to import. Verify the provided file path or URL.")
 
+        df = self._compact_frame(df)
+        self._fill_blank_text(df)
+
         if options["truncate"]:
             deleted, _ = RealEstateData.objects.all().delete()
             self.stdout.write(self.style.WARNING(f"Removed {deleted} existing rows."))
 
-        model_fields = RealEstateDataProcessor.COLUMN_MAP.values()
-        payloads = []
-        for row in df.to_dict(orient="records"):
-            payload = {field: row.get(field) for field in model_fields}
-            payloads.append(RealEstateData(**payload))
+        # Stream plain tuples one row at a time into a constructor specialised for
+        # the imported columns. The processor guarantees every mapped column exists.
+        model_fields = list(RealEstateDataProcessor.COLUMN_MAP.values())
+        make_row = build_row_factory(RealEstateData, model_fields)
+        instances = (
+            make_row(values)
+            for values in df[model_fields].itertuples(index=False, name=None)
+        )
+
+        update_fields = [field for field in model_fields if field not in UNIQUE_FIELDS] + ["updated_at"]
+        if connection.vendor == "postgresql":
+            imported = self._load_via_staging_table(instances, model_fields, update_fields)
+        else:
+            imported = self._load_in_batches(instances, update_fields)
+
+        # Cached analyses and localities were computed from the previous data set.
+        CachedAnalysis.objects.all().delete()
+        cache.delete(cache_keys.AVAILABLE_LOCALITIES)
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {imported} real estate rows."))
+
+    @staticmethod
+    def _compact_frame(df):
+        """Shrink metric columns where no value changes and turn extension strings into Python strings.
+
+        Integer columns are downcast to the smallest type that holds them; float
+        columns become float32 only if every value survives the round trip.
+        Columns are replaced in place: the frame belongs to this command's
+        processor, and copying it would double peak memory.
+        """
+        for col in df.columns:
+            values = df[col]
+            if pd.api.types.is_integer_dtype(values.dtype):
+                df[col] = pd.to_numeric(values, downcast="integer")
+            elif pd.api.types.is_float_dtype(values.dtype):
+                narrow = values.astype("float32")
+                if np.array_equal(narrow.to_numpy(dtype="float64"), values.to_numpy(), equal_nan=True):
+                    df[col] = narrow
+            elif pd.api.types.is_string_dtype(values.dtype) and values.dtype != object:
+                df[col] = values.astype(object).where(values.notna(), None)
+        return df
+
+    @staticmethod
+    def _fill_blank_text(df):
+        """Store missing cells of non-nullable text fields as '' rather than NULL or "nan"."""
+        for field in RealEstateData._meta.concrete_fields:
+            if field.get_internal_type() != "CharField" or field.null or field.attname not in df.columns:
+                continue
+            if df[field.attname].isna().any():
+                df[field.attname] = df[field.attname].fillna("")
+
+    @classmethod
+    def _load_in_batches(cls, instances, update_fields):
+        """Upsert in fixed-size chunks so only BATCH_SIZE model instances are alive at once."""
+        imported = 0
+        buffer = []
+        for instance in instances:
+            buffer.append(instance)
+            if len(buffer) == BATCH_SIZE:
+                imported += cls._flush(buffer, update_fields)
+        imported += cls._flush(buffer, update_fields)
+        return imported
+
+    @staticmethod
+    def _flush(buffer, update_fields):
+        """Upsert the buffered instances in a single transaction and empty the buffer."""
+        if not buffer:
+            return 0
+        # MySQL infers the conflict target and rejects unique_fields.
+        unique_fields = UNIQUE_FIELDS if connection.features.supports_update_conflicts_with_target else None
+        with transaction.atomic():
+            RealEstateData.objects.bulk_create(
+                buffer,
+                batch_size=BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=update_fields,
+            )
+        count = len(buffer)
+        buffer.clear()
+        return count
+
+    @classmethod
+    def _load_via_staging_table(cls, instances, model_fields, update_fields):
+        """PostgreSQL: COPY rows into an UNLOGGED staging table, then upsert them at once.
+
+        The staging table skips WAL and has no indexes, so the indexes on the real
+        table are maintained by a single INSERT ... SELECT instead of per batch.
+        Everything runs in one transaction.
+        """
+        qn = connection.ops.quote_name
+        opts = RealEstateData._meta
+        fields = [opts.get_field(name) for name in model_fields]
+        table = qn(opts.db_table)
+        staging = qn(f"{opts.db_table}_staging_{uuid.uuid4().hex[:8]}")
+        columns = ", ".join(qn(field.column) for field in fields)
+        timestamps = ", ".join(qn(opts.get_field(name).column) for name in ("created_at", "updated_at"))
+        conflict = ", ".join(qn(opts.get_field(name).column) for name in UNIQUE_FIELDS)
+        assignments = ", ".join(
+            f"{qn(opts.get_field(name).column)} = EXCLUDED.{qn(opts.get_field(name).column)}"
+            for name in update_fields
+        )
+        copy_sql = f"COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+
+        imported = 0
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"CREATE UNLOGGED TABLE {staging} AS SELECT {columns} FROM {table} WITH NO DATA")
+
+            batch = list(islice(instances, BATCH_SIZE))
+            while batch:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                for obj in batch:
+                    writer.writerow([cls._copy_value(field, getattr(obj, field.attname)) for field in fields])
+                cls._copy_from(cursor, copy_sql, buffer)
+                imported += len(batch)
+                batch = list(islice(instances, BATCH_SIZE))
+
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}, {timestamps}) "
+                f"SELECT {columns}, NOW(), NOW() FROM {staging} "
+                f"ON CONFLICT ({conflict}) DO UPDATE SET {assignments}"
+            )
+            cursor.execute(f"DROP TABLE {staging}")
+        return imported
+
+    @staticmethod
+    def _copy_value(field, value):
+        # Missing metrics arrive as float NaN; store them as NULL, as bulk_create does.
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            return COPY_NULL
+        value = field.get_db_prep_save(value, connection=connection)
+        return COPY_NULL if value is None else value
 
-        RealEstateData.objects.bulk_create(payloads, batch_size=500)
-        self.stdout.write(self.style.SUCCESS(f"Imported {len(payloads)} real estate rows."))
+    @staticmethod
+    def _copy_from(cursor, sql, buffer):
+        """Stream ``buffer`` through COPY with either psycopg2 or psycopg 3."""
+        raw_cursor = cursor.cursor
+        if hasattr(raw_cursor, "copy_expert"):
+            buffer.seek(0)
+            raw_cursor.copy_expert(sql, buffer)
+        else:
+            with raw_cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
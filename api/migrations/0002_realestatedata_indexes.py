@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-14 05:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='realestatedata',
+            index=models.Index(fields=['city', 'year'], name='api_realest_city_17c677_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='realestatedata',
+            index=models.Index(fields=['final_location', 'year'], name='api_realest_final_l_bbbb86_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='realestatedata',
+            index=models.Index(fields=['year'], name='api_realest_year_05bd08_idx'),
+        ),
+    ]
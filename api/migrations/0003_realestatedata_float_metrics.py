@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-14 05:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_realestatedata_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='realestatedata',
+            name='flat_weighted_avg_rate',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='realestatedata',
+            name='office_weighted_avg_rate',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='realestatedata',
+            name='others_weighted_avg_rate',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='realestatedata',
+            name='shop_weighted_avg_rate',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='realestatedata',
+            name='total_carpet_area',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='realestatedata',
+            name='total_sales',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-14 05:27
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_realestatedata_float_metrics'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='realestatedata',
+            index=models.Index(django.db.models.functions.text.Lower('final_location'), models.F('year'), name='api_realest_final_lc_year_idx'),
+        ),
+    ]
@@ -1,4 +1,8 @@
+import hashlib
+import json
+
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class RealEstateData(models.Model):
@@ -10,7 +14,7 @@ class RealEstateData(models.Model):
     loc_lat = models.FloatField(null=True, blank=True)
     loc_lng = models.FloatField(null=True, blank=True)
 
-    total_sales = models.DecimalField(max_digits=20, decimal_places=2, null=True, blank=True)
+    total_sales = models.FloatField(null=True, blank=True)
     total_sold = models.IntegerField(null=True, blank=True)
     flat_sold = models.IntegerField(null=True, blank=True)
     office_sold = models.IntegerField(null=True, blank=True)
@@ -20,10 +24,10 @@ class RealEstateData(models.Model):
     other_sold = models.IntegerField(null=True, blank=True)
     residential_sold = models.IntegerField(null=True, blank=True)
 
-    flat_weighted_avg_rate = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
-    office_weighted_avg_rate = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
-    others_weighted_avg_rate = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
-    shop_weighted_avg_rate = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    flat_weighted_avg_rate = models.FloatField(null=True, blank=True)
+    office_weighted_avg_rate = models.FloatField(null=True, blank=True)
+    others_weighted_avg_rate = models.FloatField(null=True, blank=True)
+    shop_weighted_avg_rate = models.FloatField(null=True, blank=True)
 
     flat_prevailing_rate_range = models.CharField(max_length=100, blank=True)
     office_prevailing_rate_range = models.CharField(max_length=100, blank=True)
@@ -31,7 +35,7 @@ class RealEstateData(models.Model):
     shop_prevailing_rate_range = models.CharField(max_length=100, blank=True)
 
     total_units = models.IntegerField(null=True, blank=True)
-    total_carpet_area = models.DecimalField(max_digits=20, decimal_places=2, null=True, blank=True)
+    total_carpet_area = models.FloatField(null=True, blank=True)
     flat_total = models.IntegerField(null=True, blank=True)
     shop_total = models.IntegerField(null=True, blank=True)
     office_total = models.IntegerField(null=True, blank=True)
@@ -43,6 +47,13 @@ class RealEstateData(models.Model):
     class Meta:
         ordering = ['final_location', 'year']
         unique_together = ('final_location', 'year', 'city')
+        indexes = [
+            models.Index(fields=['city', 'year']),
+            models.Index(fields=['final_location', 'year']),
+            models.Index(fields=['year']),
+            # Case-insensitive locality lookups (RealEstateDataProcessor.filter_queryset).
+            models.Index(Lower('final_location'), 'year', name='api_realest_final_lc_year_idx'),
+        ]
 
     def __str__(self):
         return f"{self.final_location} ({self.city}) - {self.year}"
@@ -118,3 +129,9 @@ class CachedAnalysis(models.Model):
     
     def __str__(self):
         return f"Cache for {self.query_hash} ({self.access_count} accesses)"
+
+    @staticmethod
+    def hash_params(params):
+        """Return the SHA-256 hex digest identifying a set of query parameters."""
+        payload = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
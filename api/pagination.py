@@ -0,0 +1,16 @@
+from rest_framework.pagination import LimitOffsetPagination
+
+
+class TableRowsPagination(LimitOffsetPagination):
+    """Limit/offset pagination over the rows of a filtered DataFrame."""
+
+    default_limit = 40
+    max_limit = 1000
+
+    def paginate_dataframe(self, df, request):
+        """Return the requested slice of ``df`` and record the paging state."""
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.offset = self.get_offset(request)
+        self.count = len(df)
+        return df.iloc[self.offset:self.offset + self.limit]
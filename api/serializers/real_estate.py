@@ -2,6 +2,21 @@ from rest_framework import serializers
 from django.core.validators import MinValueValidator, MaxValueValidator
 import re
 
+from ..utils.data_processor import match_locality
+
+_YEAR_RE = re.compile(r'\d{4}')
+
+_LOCALITY_MAP = {
+    "wakad": "Wakad",
+    "aundh": "Aundh",
+    "baner": "Baner",
+    "hinjewadi": "Hinjewadi",
+}
+# Sorted like the processor's localities, so match_locality picks the same one.
+_LOCALITIES_LC = sorted(_LOCALITY_MAP.items(), key=lambda item: item[1])
+
+_PROPERTY_TYPES = frozenset({'flat', 'office', 'shop', 'others', 'commercial', 'residential'})
+
 
 class RealEstateDataSerializer(serializers.Serializer):
     """Serializer for the real estate data model."""
@@ -55,18 +70,12 @@ class AnalysisQuerySerializer(serializers.Serializer):
         validators=[MinValueValidator(2000), MaxValueValidator(2100)]
     )
 
-    property_type = serializers.ChoiceField(
-        required=False,
-        allow_blank=True,
-        choices=[
-            ('flat', 'Flat'),
-            ('office', 'Office'),
-            ('shop', 'Shop'),
-            ('others', 'Others'),
-            ('commercial', 'Commercial'),
-            ('residential', 'Residential'),
-        ]
-    )
+    property_type = serializers.CharField(required=False, allow_blank=True)
+
+    def validate_property_type(self, value):
+        if value and value not in _PROPERTY_TYPES:
+            raise serializers.ValidationError(f'"{value}" is not a valid choice.', code='invalid_choice')
+        return value
 
     def validate(self, data):
         """Extra validation and NLP extraction."""
@@ -78,7 +87,7 @@ class AnalysisQuerySerializer(serializers.Serializer):
 
         # Extract years from query
         if not data.get('year_from') or not data.get('year_to'):
-            year_matches = re.findall(r'(\d{4})', data['query'])
+            year_matches = _YEAR_RE.findall(data['query'])
             if len(year_matches) >= 2:
                 years = sorted([int(y) for y in year_matches])
                 data['year_from'] = years[0]
@@ -86,17 +95,9 @@ class AnalysisQuerySerializer(serializers.Serializer):
 
         # Extract locality from query
         if not data.get('locality'):
-            q = data['query'].lower()
-            mapping = {
-                "wakad": "Wakad",
-                "aundh": "Aundh",
-                "baner": "Baner",
-                "hinjewadi": "Hinjewadi"
-            }
-            for key, value in mapping.items():
-                if key in q:
-                    data['locality'] = value
-                    break
+            locality = match_locality(data['query'].lower(), _LOCALITIES_LC)
+            if locality:
+                data['locality'] = locality
 
         return data
 
@@ -115,6 +116,6 @@ class AnalysisResultSerializer(serializers.Serializer):
 class ExportDataSerializer(serializers.Serializer):
     """Serializer for exporting filtered analysis data."""
 
-    format = serializers.ChoiceField(choices=[('csv', 'CSV'), ('excel', 'Excel')], default='csv')
+    format = serializers.ChoiceField(choices=[('csv', 'CSV'), ('excel', 'Excel'), ('parquet', 'Parquet')], default='csv')
     include_charts = serializers.BooleanField(default=True)
     include_raw_data = serializers.BooleanField(default=True)
@@ -0,0 +1,225 @@
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .management.commands.import_real_estate_data import COPY_NULL, Command as ImportCommand
+from .models import CachedAnalysis, RealEstateData
+from .serializers.real_estate import AnalysisQuerySerializer
+from .utils import data_processor
+from .utils.data_processor import RealEstateDataProcessor
+from .views import CACHED_ANALYSIS_MAX_AGE, _iter_csv
+
+
+class DatabaseFilterTests(TestCase):
+    """Filters that match no rows when the data is served from the database."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for year in (2020, 2021):
+            RealEstateData.objects.create(
+                final_location='Wakad', city='Pune', year=year,
+                total_sales=1000.0, total_sold=10, flat_sold=5,
+                flat_weighted_avg_rate=5000.0,
+            )
+
+    def setUp(self):
+        # Views share a per-process processor; start each test from this data.
+        data_processor._PROCESSOR_SINGLETON = None
+        self.client = APIClient()
+
+    def test_filter_data_returns_empty_frame(self):
+        processor = RealEstateDataProcessor()
+        filtered = processor.filter_data({'locality': 'Nowhere'})
+
+        self.assertTrue(filtered.empty)
+        self.assertIn('final_location', filtered.columns)
+
+    def test_analyze_without_matches(self):
+        response = self.client.get('/api/analyze/', {'query': 'Analyze', 'locality': 'Nowhere'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['summary'], 'No data available for the specified filters.')
+        self.assertEqual(response.data['table_data'], [])
+
+    def test_rows_without_matches(self):
+        response = self.client.get('/api/analyze/rows/', {'query': 'Wakad 1990-1991'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 0)
+
+    def test_export_without_matches(self):
+        response = self.client.post('/api/export/', {'locality': 'Nowhere'}, format='json')
+
+        self.assertEqual(response.status_code, 404)
+
+
+class SharedProcessorTests(TestCase):
+    """get_processor() notices imports made by other processes."""
+
+    def setUp(self):
+        data_processor._PROCESSOR_SINGLETON = None
+        RealEstateData.objects.create(final_location='Wakad', city='Pune', year=2020, total_sold=10)
+
+    def test_new_rows_replace_the_shared_processor(self):
+        first = data_processor.get_processor()
+        self.assertIs(data_processor.get_processor(), first)
+
+        RealEstateData.objects.create(final_location='Baner', city='Pune', year=2020, total_sold=5)
+        with mock.patch.object(data_processor, 'PROCESSOR_VERSION_CHECK_INTERVAL', 0):
+            second = data_processor.get_processor()
+
+        self.assertIsNot(second, first)
+        self.assertEqual(second.unique_localities, ['Baner', 'Wakad'])
+        # Requests still holding the old processor keep a consistent view.
+        self.assertEqual(first.unique_localities, ['Wakad'])
+
+
+class CompactFrameTests(SimpleTestCase):
+    """The importer downcasts metric columns only where no value changes."""
+
+    def test_downcasts_without_changing_values(self):
+        df = pd.DataFrame({
+            'total_sold': [10, 20_000],
+            'loc_lat': [18.5, np.nan],
+            'total_sales': [0.1, 2.5],
+            'city': pd.array(['Pune', None], dtype='string[pyarrow]'),
+        })
+        expected = df[['total_sold', 'loc_lat', 'total_sales']].copy()
+
+        ImportCommand._compact_frame(df)
+
+        self.assertEqual(df['total_sold'].dtype, np.int16)
+        self.assertEqual(df['loc_lat'].dtype, np.float32)
+        # 0.1 has no exact float32 representation.
+        self.assertEqual(df['total_sales'].dtype, np.float64)
+        self.assertEqual(df['city'].tolist(), ['Pune', None])
+        pd.testing.assert_frame_equal(
+            df[expected.columns], expected, check_dtype=False, check_exact=True
+        )
+
+
+class CopyValueTests(SimpleTestCase):
+    """PostgreSQL COPY rows store missing metrics as NULL, like bulk_create."""
+
+    def test_nan_is_written_as_null(self):
+        for name in ('total_sales', 'total_sold'):
+            field = RealEstateData._meta.get_field(name)
+            self.assertEqual(ImportCommand._copy_value(field, float('nan')), COPY_NULL)
+            self.assertEqual(ImportCommand._copy_value(field, None), COPY_NULL)
+
+    def test_values_are_kept(self):
+        field = RealEstateData._meta.get_field('total_sales')
+        self.assertEqual(ImportCommand._copy_value(field, 18.5), 18.5)
+
+
+class CsvExportTests(SimpleTestCase):
+    """Streamed CSV exports match a single DataFrame.to_csv call."""
+
+    def test_chunks_match_to_csv(self):
+        df = pd.DataFrame({
+            'final_location': ['Wakad', 'Baner', 'Aundh'],
+            'year': [2020, 2021, 2022],
+            'flat_prevailing_rate_range': ['5000-6000', 7000, np.nan],
+        })
+
+        streamed = b''.join(_iter_csv(df, chunk_rows=2))
+
+        self.assertEqual(streamed, df.to_csv(index=False).encode('utf-8'))
+
+
+class ParquetCacheTests(SimpleTestCase):
+    """The cleaned local dataset round-trips through the Parquet cache."""
+
+    def test_mixed_text_and_number_column(self):
+        rows = {source: [1, 2] for source in RealEstateDataProcessor.COLUMN_MAP}
+        rows.update({
+            'final location': ['Wakad', 'Baner'],
+            'year': [2020, 2021],
+            'city': ['Pune', 'Pune'],
+            # Excel gives back the first cell as a number and the second as text.
+            'flat - most prevailing rate - range': [7000, '5000-6000'],
+        })
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data.xlsx')
+            pd.DataFrame(rows).to_excel(path, index=False, engine='xlsxwriter')
+
+            parsed = RealEstateDataProcessor(excel_file_path=path, prefer_database=False)
+            self.assertTrue(os.path.exists(parsed._parquet_cache_path))
+
+            with mock.patch.object(data_processor.pd, 'read_excel') as read_excel:
+                cached = RealEstateDataProcessor(excel_file_path=path, prefer_database=False)
+            read_excel.assert_not_called()
+
+        pd.testing.assert_frame_equal(cached.df, parsed.df)
+        self.assertEqual(
+            cached.df.set_index('final_location')['flat_prevailing_rate_range'].to_dict(),
+            {'Baner': '5000-6000', 'Wakad': '7000'},
+        )
+
+
+class CachedAnalysisTests(TestCase):
+    """Stored analyses are only served for the data they were computed from."""
+
+    def setUp(self):
+        data_processor._PROCESSOR_SINGLETON = None
+        self.row = RealEstateData.objects.create(
+            final_location='Wakad', city='Pune', year=2020, total_sales=1000.0, total_sold=10,
+        )
+        self.client = APIClient()
+
+    def analyze(self):
+        # Check the database on every request instead of every 30 seconds.
+        with mock.patch.object(data_processor, 'PROCESSOR_VERSION_CHECK_INTERVAL', 0):
+            return self.client.get('/api/analyze/', {'query': 'Analyze Wakad'})
+
+    def test_edited_rows_are_not_served_from_the_cache(self):
+        self.assertIn('₹1,000 in total sales', self.analyze().data['summary'])
+
+        self.row.total_sales = 2500.0
+        self.row.save()
+
+        self.assertIn('₹2,500 in total sales', self.analyze().data['summary'])
+
+    def test_expired_results_are_recomputed_and_pruned(self):
+        self.analyze()
+        expired = timezone.now() - timedelta(seconds=CACHED_ANALYSIS_MAX_AGE + 1)
+        CachedAnalysis.objects.update(created_at=expired)
+
+        self.analyze()
+
+        self.assertEqual(CachedAnalysis.objects.count(), 1)
+        self.assertFalse(CachedAnalysis.objects.filter(created_at__lt=expired + timedelta(seconds=1)).exists())
+
+
+class LocalityMatchingTests(TestCase):
+    """The query serializer and the processor pick the same locality from a query."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for locality in ('Wakad', 'Aundh', 'Baner', 'Hinjewadi'):
+            RealEstateData.objects.create(final_location=locality, city='Pune', year=2020)
+
+    def test_serializer_and_processor_agree(self):
+        processor = RealEstateDataProcessor()
+        queries = [
+            'Compare demand between Wakad and Hinjewadi',
+            'wakad vs aundh',
+            'Show apartment prices in Baner',
+            'Baner-Wakad corridor',
+            'hinjewadiwakad',
+        ]
+        for query in queries:
+            with self.subTest(query=query):
+                serializer = AnalysisQuerySerializer(data={'query': query})
+                self.assertTrue(serializer.is_valid(), serializer.errors)
+                self.assertEqual(
+                    serializer.validated_data.get('locality'),
+                    processor.extract_filters(query)['locality'],
+                )
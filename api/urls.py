@@ -6,6 +6,7 @@ app_name = 'api'
 urlpatterns = [
     # Main analysis endpoint (supports both GET and POST)
     path('analyze/', views.RealEstateAnalysisView.as_view(), name='analyze'),
+    path('analyze/rows/', views.AnalysisRowsView.as_view(), name='analyze-rows'),
     
     # Additional endpoints for frontend
     path('localities/', views.AvailableLocalitiesView.as_view(), name='localities'),
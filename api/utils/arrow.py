@@ -0,0 +1,16 @@
+"""Helpers for handing DataFrames to pyarrow (Parquet cache and exports)."""
+
+import pandas as pd
+
+
+def arrow_compatible(df):
+    """Cast object columns that mix text and numbers (common in Excel input) to str.
+
+    Arrow needs one type per column; missing cells are left missing.
+    """
+    mixed = {
+        col: df[col].where(df[col].isna(), df[col].astype(str))
+        for col in df.select_dtypes(include='object').columns
+        if pd.api.types.infer_dtype(df[col], skipna=True) not in ('string', 'empty')
+    }
+    return df.assign(**mixed) if mixed else df
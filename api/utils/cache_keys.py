@@ -0,0 +1,4 @@
+"""Cache keys shared between the API views and the import command."""
+
+AVAILABLE_LOCALITIES = 'available_localities'
+AVAILABLE_LOCALITIES_TIMEOUT = 60 * 60
@@ -1,10 +1,44 @@
+import copy
+import functools
+import io
+import logging
 import os
 import re
+import threading
+import time
+from urllib.request import urlopen
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+from cachalot.api import cachalot_disabled
 from datetime import datetime
 from django.apps import apps
 from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Count, Max
+from django.db.models.functions import Lower
+
+from .arrow import arrow_compatible
+
+try:
+    import numexpr
+except ImportError:  # pragma: no cover - optional dependency
+    numexpr = None
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+logger = logging.getLogger(__name__)
+
+_PROCESSOR_SINGLETON = None
+_PROCESSOR_DATA_VERSION = None
+_PROCESSOR_CHECKED_AT = 0.0
+_PROCESSOR_LOCK = threading.Lock()
+
+# How often (seconds) get_processor checks the database for a newer import.
+PROCESSOR_VERSION_CHECK_INTERVAL = 30
 
 class RealEstateDataProcessor:
     """Utility class for processing real estate data from Excel/Sheets."""
@@ -49,7 +83,44 @@ class RealEstateDataProcessor:
     ]
 
     PROPERTY_COLUMNS = ['flat', 'office', 'shop', 'others', 'commercial', 'residential']
+
+    # Characters dropped from numeric cells in a single str.translate pass.
+    NUMERIC_JUNK = str.maketrans('', '', ',₹')
+
+    YEAR_RANGE_RE = re.compile(r'(\d{4})\s*-\s*(\d{4})')
+    LAST_YEARS_RE = re.compile(r'last\s+(\d+)\s+years?', re.IGNORECASE)
+
+    # With at least this many localities, query matching uses an Aho-Corasick automaton.
+    LOCALITY_AUTOMATON_MIN = 50
+
+    # Frames at least this long evaluate the year range with numexpr.
+    NUMEXPR_MIN_ROWS = 10_000
+
+    # Part of the Parquet cache file name; bump it whenever the cleaning in
+    # _load_from_external_source changes so caches of the old output are ignored.
+    PARQUET_CACHE_VERSION = 1
+
+    # Distinct (query, filters, table_limit) results kept per loaded dataset.
+    QUERY_CACHE_SIZE = 256
     DB_FIELDS = list(COLUMN_MAP.values())
+    # Columns used for filtering, summaries, charts and tables. Frames loaded
+    # from the database hold only these (indexed by row id); with_extra_columns
+    # fetches the export-only EXTRA_FIELDS on demand.
+    CORE_FIELDS = [
+        'final_location', 'year', 'city', 'total_sales', 'total_sold', 'flat_sold',
+        'office_sold', 'others_sold', 'shop_sold', 'commercial_sold', 'other_sold',
+        'residential_sold', 'flat_weighted_avg_rate', 'office_weighted_avg_rate',
+        'others_weighted_avg_rate', 'shop_weighted_avg_rate'
+    ]
+    EXTRA_FIELDS = [
+        'loc_lat', 'loc_lng', 'flat_prevailing_rate_range', 'office_prevailing_rate_range',
+        'others_prevailing_rate_range', 'shop_prevailing_rate_range', 'total_units',
+        'total_carpet_area', 'flat_total', 'shop_total', 'office_total', 'others_total'
+    ]
+    SOLD_COLUMNS = [col for col in DB_FIELDS if col.endswith('_sold')]
+    SUMMARY_RATE_COLUMNS = ['flat_weighted_avg_rate', 'office_weighted_avg_rate', 'shop_weighted_avg_rate']
+    # Rows fetched per round trip when streaming the table (server-side cursor on PostgreSQL).
+    DB_CHUNK_SIZE = 2000
 
     def __init__(self, excel_file_path=None, data_url=None, prefer_database=True):
         self.excel_file_path = excel_file_path or settings.EXCEL_FILE_PATH
@@ -60,6 +131,14 @@ class RealEstateDataProcessor:
         )
         self.prefer_database = prefer_database
         self.df = None
+        self.data_version = None
+        self._from_database = False
+        self._location_codes = None
+        self._location_categories_lc = None
+        self._unique_localities = []
+        self._localities_lc = []
+        self._locality_automaton = None
+        self._query_cache = None
         self.load_data()
     
     def load_data(self):
@@ -67,16 +146,51 @@ class RealEstateDataProcessor:
         try:
             df = None
             if self.prefer_database:
+                # Read before the rows, so an import landing mid-load shows up
+                # as a newer version rather than being hidden by this one.
+                version = _data_version()
                 df = self._load_from_database()
+            from_database = df is not None
 
             if df is None:
                 df = self._load_from_external_source()
+                version = self._external_version()
 
+            df = self._compact_dtypes(df)
+
+            # Locality filters compare category codes against the lowercased
+            # categories, so no per-row string work happens at query time.
+            locations = df['final_location'].cat
+            self._location_codes = locations.codes.to_numpy()
+            self._location_categories_lc = locations.categories.str.lower()
+            # astype('category') stores the distinct values sorted, so the
+            # categories are the sorted unique localities.
+            self._unique_localities = locations.categories.tolist()
+            self._localities_lc = [(loc.lower(), loc) for loc in self._unique_localities]
+            self._locality_automaton = self._build_locality_automaton(self._localities_lc)
             self.df = df
+            self.data_version = version
+            self._from_database = from_database
+            # Replaced last so no cached result can outlive the data it came from.
+            self._query_cache = functools.lru_cache(maxsize=self.QUERY_CACHE_SIZE)(self._run_query)
 
         except Exception as e:
             raise Exception(f"Error loading Excel data: {str(e)}")
 
+    @property
+    def unique_localities(self):
+        """Sorted distinct localities in the loaded dataset."""
+        return self._unique_localities
+
+    def refresh(self):
+        """Reload the dataset from its source, replacing the current DataFrame.
+
+        This updates the instance in place, so it is not safe on a processor other
+        threads are using; refresh the shared one with refresh_processor().
+        """
+        self.load_data()
+        return self
+
     def _load_from_database(self):
         """Load data from the RealEstateData model if rows exist."""
         try:
@@ -88,33 +202,95 @@ class RealEstateDataProcessor:
         if not queryset.exists():
             return None
 
-        df = pd.DataFrame(list(queryset.values(*self.DB_FIELDS)))
+        df = self._frame_from_queryset(queryset)
         if df.empty:
             return None
+        return df
 
-        for col in self.NUMERIC_COLUMNS:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+    def _frame_from_queryset(self, queryset):
+        """Build a cleaned DataFrame (possibly empty) from RealEstateData rows."""
+        # Stream tuples straight into the frame instead of caching the whole
+        # result set on the queryset first. cachalot would list() the iterator
+        # and pickle every row into the cache, so it is bypassed here.
+        fields = ['id', *self.CORE_FIELDS]
+        with cachalot_disabled():
+            rows = queryset.values_list(*fields).iterator(chunk_size=self.DB_CHUNK_SIZE)
+            # from_records(index=...) fails on an empty result, so index afterwards.
+            df = pd.DataFrame.from_records(rows, columns=fields).set_index('id')
+        df = self._coerce_numeric(df)
 
         df['year'] = df['year'].astype(int)
         df = df.dropna(subset=['final_location', 'city'])
-        df = df.sort_values(['final_location', 'year']).reset_index(drop=True)
+        df = df.sort_values(['final_location', 'year'])
         return df
 
+    def _load_extras_for(self, ids):
+        """Fetch EXTRA_FIELDS for the given RealEstateData ids, indexed by id."""
+        RealEstateData = apps.get_model('api', 'RealEstateData')
+        fields = ['id', *self.EXTRA_FIELDS]
+        ids = list(ids)
+        rows = []
+        # Chunked so the IN clause stays under the backend's parameter limit.
+        # Each chunk is a one-off id set, so cachalot is bypassed here as well.
+        with cachalot_disabled():
+            for start in range(0, len(ids), self.DB_CHUNK_SIZE):
+                chunk = ids[start:start + self.DB_CHUNK_SIZE]
+                rows.extend(RealEstateData.objects.filter(id__in=chunk).values_list(*fields))
+        df = pd.DataFrame.from_records(rows, columns=fields).set_index('id')
+        return self._coerce_numeric(df)
+
+    def with_extra_columns(self, df):
+        """Return ``df`` with every DB_FIELDS column, fetching the export-only ones if needed."""
+        missing = [col for col in self.EXTRA_FIELDS if col not in df.columns]
+        if not missing:
+            return df
+        extras = self._load_extras_for(df.index)
+        return df.join(extras[missing])[self.DB_FIELDS]
+
+    def _coerce_numeric(self, df):
+        for col in self.NUMERIC_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+        return df
+
+    def _has_local_file(self):
+        return bool(
+            self.excel_file_path
+            and os.path.exists(self.excel_file_path)
+            and os.path.getsize(self.excel_file_path) > 0
+        )
+
+    def _external_version(self):
+        """Identify the file (and its modification time) or URL the data came from."""
+        if self._has_local_file():
+            return self.excel_file_path, os.path.getmtime(self.excel_file_path)
+        return self.data_url
+
     def _load_from_external_source(self):
         """Load data from Excel file or Google Sheet URL."""
-        if self.excel_file_path and os.path.exists(self.excel_file_path) and os.path.getsize(self.excel_file_path) > 0:
+        has_local_file = self._has_local_file()
+        if has_local_file:
+            df = self._read_parquet_cache()
+            if df is not None:
+                return df
+
             if self.excel_file_path.lower().endswith('.csv'):
-                df = pd.read_csv(self.excel_file_path)
+                df = pd.read_csv(self.excel_file_path, engine='pyarrow')
             else:
-                df = pd.read_excel(self.excel_file_path, engine='openpyxl')
+                df = pd.read_excel(self.excel_file_path, engine='calamine')
         elif self.data_url:
-            df = pd.read_csv(self.data_url)
+            # Download once, then let pyarrow parse the buffer with multiple threads.
+            # pandas' pyarrow engine keeps pandas' NA markers (blank, 'NA', ...).
+            with urlopen(self.data_url) as response:
+                buffer = io.BytesIO(response.read())
+            df = pd.read_csv(buffer, engine='pyarrow')
         else:
             raise FileNotFoundError(
                 "No real estate dataset found. Provide an Excel file or set REAL_ESTATE_DATA_URL."
             )
 
+        df = self._missing_as_nan(df)
+
         df.columns = [col.strip().lower() for col in df.columns]
         df = df.rename(columns=self.COLUMN_MAP)
 
@@ -124,21 +300,82 @@ class RealEstateDataProcessor:
 
         for col in self.NUMERIC_COLUMNS:
             if col in df.columns:
-                df[col] = pd.to_numeric(df[col].apply(self._clean_numeric_value), errors='coerce')
+                df[col] = self._clean_numeric_column(df[col])
 
         df['year'] = df['year'].astype(int)
         df = df.dropna(subset=['final_location', 'city'])
         df = df.sort_values(['final_location', 'year']).reset_index(drop=True)
+        # Text columns holding some numeric cells (e.g. Excel rate ranges) become
+        # str, so the frame is the same whether it is parsed or read from Parquet.
+        df = arrow_compatible(df)
+
+        if has_local_file:
+            self._write_parquet_cache(df)
 
         return df
 
     @staticmethod
-    def _clean_numeric_value(value):
-        if isinstance(value, str):
-            value = value.replace(',', '').replace('₹', '').strip()
-            if value == '' or value.lower() == 'na':
-                return np.nan
-        return value
+    def _compact_dtypes(df):
+        """Store the repeated location strings as categories and years as int32.
+
+        The metric columns stay float64: float32 would change the values that
+        end up in summaries and API responses.
+        """
+        df['final_location'] = df['final_location'].astype('category')
+        df['city'] = df['city'].astype('category')
+        df['year'] = df['year'].astype('int32')
+        return df
+
+    @staticmethod
+    def _missing_as_nan(df):
+        """Use NaN for missing cells in object columns, as pandas' default parsers do.
+
+        The pyarrow engine and Parquet round-trips yield None there instead.
+        """
+        for col in df.select_dtypes(include='object').columns:
+            values = df[col]
+            if values.isna().any():
+                df[col] = values.where(values.notna(), np.nan)
+        return df
+
+    @property
+    def _parquet_cache_path(self):
+        return f"{self.excel_file_path}.v{self.PARQUET_CACHE_VERSION}.parquet"
+
+    def _read_parquet_cache(self):
+        """Return the cleaned frame cached next to the local file, if still fresh."""
+        cache_path = self._parquet_cache_path
+        try:
+            if os.path.getmtime(cache_path) < os.path.getmtime(self.excel_file_path):
+                return None
+            df = pd.read_parquet(cache_path)
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logger.warning("Ignoring unreadable parquet cache %s: %s", cache_path, exc)
+            return None
+
+        if any(col not in df.columns for col in self.COLUMN_MAP.values()):
+            return None
+        # Parquet hands back missing text as None; match a fresh parse.
+        return self._missing_as_nan(df)
+
+    def _write_parquet_cache(self, df):
+        """Cache the cleaned frame so later loads skip Excel/CSV parsing."""
+        try:
+            df.to_parquet(self._parquet_cache_path, compression='snappy', index=False)
+        except Exception as exc:
+            logger.warning("Unable to write parquet cache %s: %s", self._parquet_cache_path, exc)
+
+    @classmethod
+    def _clean_numeric_column(cls, series):
+        """Strip thousands separators and ₹ signs and convert the column to numbers."""
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            return series
+        cleaned = series.astype('string').str.translate(cls.NUMERIC_JUNK).str.strip()
+        cleaned = cleaned.mask(cleaned.str.lower().isin(['', 'na']))
+        # Back to object so to_numeric returns numpy dtypes rather than Float64/Int64.
+        return pd.to_numeric(cleaned.astype(object), errors='coerce')
     
     def filter_data(self, filters=None):
         """
@@ -155,48 +392,114 @@ class RealEstateDataProcessor:
         """
         if filters is None:
             filters = {}
-            
-        df_filtered = self.df.copy()
-        
+
+        if self._from_database:
+            # Let the database apply the filters (and its indexes) rather than
+            # slicing the in-memory copy of the whole table.
+            if not self._orm_lookups(filters):
+                return self.df
+            return self._compact_dtypes(self._frame_from_queryset(self.filter_queryset(filters)))
+
+        df = self.df
+        # Combine every condition into one mask and slice once; callers only
+        # read the result, so an unfiltered request gets self.df itself.
+        mask = None
+
         # Apply locality filter
         locality = filters.get('locality')
         if locality:
-            df_filtered = df_filtered[
-                df_filtered['final_location'].str.lower() == locality.lower()
-            ]
+            matching_codes = np.flatnonzero(self._location_categories_lc == locality.lower())
+            mask = self._and(mask, np.isin(self._location_codes, matching_codes))
         
         # Apply year range filter
-        year_range = filters.get('year_range')
-        if year_range:
-            current_year = datetime.now().year
-            
-            # Handle 'last N years' format
-            if year_range.lower().startswith('last '):
-                try:
-                    years = int(year_range.split()[1])
-                    min_year = current_year - years
-                    df_filtered = df_filtered[df_filtered['year'] >= min_year]
-                except (ValueError, IndexError):
-                    pass
-            # Handle 'YYYY-YYYY' format
-            elif '-' in year_range:
-                try:
-                    start_year, end_year = map(int, year_range.split('-'))
-                    df_filtered = df_filtered[
-                        (df_filtered['year'] >= start_year) & 
-                        (df_filtered['year'] <= end_year)
-                    ]
-                except (ValueError, IndexError):
-                    pass
+        start_year, end_year = self._year_bounds(filters.get('year_range'))
+        if start_year is not None or end_year is not None:
+            years_col = df['year'].to_numpy()
+            if start_year is not None and end_year is not None:
+                mask = self._and(mask, self._between(years_col, start_year, end_year))
+            elif start_year is not None:
+                mask = self._and(mask, years_col >= start_year)
+            else:
+                mask = self._and(mask, years_col <= end_year)
         
         # Apply property type filter
-        property_type = filters.get('property_type')
-        if property_type:
-            column_name = f"{property_type.lower()}_sold"
-            if column_name in df_filtered.columns:
-                df_filtered = df_filtered[df_filtered[column_name] > 0]
+        column_name = self._property_column(filters.get('property_type'))
+        if column_name in df.columns:
+            mask = self._and(mask, (df[column_name] > 0).to_numpy())
         
-        return df_filtered
+        if mask is None:
+            return df
+        return df.loc[mask]
+
+    @staticmethod
+    def _and(mask, condition):
+        return condition if mask is None else mask & condition
+
+    @classmethod
+    def _between(cls, values, low, high):
+        """Boolean mask of low <= values <= high, fused into one pass on large arrays."""
+        if numexpr is not None and len(values) >= cls.NUMEXPR_MIN_ROWS:
+            return numexpr.evaluate(
+                '(values >= low) & (values <= high)',
+                local_dict={'values': values, 'low': low, 'high': high},
+            )
+        return (values >= low) & (values <= high)
+
+    def filter_queryset(self, filters=None):
+        """Return a RealEstateData queryset restricted by the same filters as filter_data."""
+        RealEstateData = apps.get_model('api', 'RealEstateData')
+        return (
+            RealEstateData.objects
+            .alias(location_lc=Lower('final_location'))
+            .filter(**self._orm_lookups(filters or {}))
+        )
+
+    def _orm_lookups(self, filters):
+        lookups = {}
+
+        locality = filters.get('locality')
+        if locality:
+            # Matches the functional index on Lower('final_location').
+            lookups['location_lc'] = locality.lower()
+
+        start_year, end_year = self._year_bounds(filters.get('year_range'))
+        if start_year is not None:
+            lookups['year__gte'] = start_year
+        if end_year is not None:
+            lookups['year__lte'] = end_year
+
+        column_name = self._property_column(filters.get('property_type'))
+        if column_name in self.CORE_FIELDS:
+            lookups[f'{column_name}__gt'] = 0
+
+        return lookups
+
+    @staticmethod
+    def _year_bounds(year_range):
+        """Parse 'YYYY-YYYY' or 'last N years' into (start, end); unknown parts are None."""
+        if not year_range:
+            return None, None
+
+        # Handle 'last N years' format
+        if year_range.lower().startswith('last '):
+            try:
+                years = int(year_range.split()[1])
+                return datetime.now().year - years, None
+            except (ValueError, IndexError):
+                return None, None
+
+        # Handle 'YYYY-YYYY' format
+        if '-' in year_range:
+            try:
+                start_year, end_year = map(int, year_range.split('-'))
+                return start_year, end_year
+            except (ValueError, IndexError):
+                pass
+        return None, None
+
+    @staticmethod
+    def _property_column(property_type):
+        return f"{property_type.lower()}_sold" if property_type else None
     
     def generate_summary(self, df, query=None):
         """
@@ -214,16 +517,17 @@ class RealEstateDataProcessor:
         
         # Basic statistics
         localities = df['final_location'].unique()
-        years = sorted(df['year'].unique())
+        first_year, last_year = df['year'].agg(['min', 'max'])
 
         total_sales = df['total_sales'].sum()
-        avg_flat_price = df['flat_weighted_avg_rate'].mean()
-        avg_office_price = df['office_weighted_avg_rate'].mean()
-        avg_shop_price = df['shop_weighted_avg_rate'].mean()
+        avg_flat_price, avg_office_price, avg_shop_price = (
+            df[self.SUMMARY_RATE_COLUMNS].mean().to_numpy()
+        )
 
-        property_sums = df[[col for col in df.columns if col.endswith('_sold')]].sum()
-        if not property_sums.empty:
-            top_property = property_sums.idxmax().replace('_sold', '').replace('_', ' ').title()
+        property_sums = np.nansum(df[self.SOLD_COLUMNS].to_numpy(dtype=float), axis=0)
+        if len(property_sums):
+            top_column = self.SOLD_COLUMNS[int(np.argmax(property_sums))]
+            top_property = top_column.replace('_sold', '').replace('_', ' ').title()
         else:
             top_property = 'N/A'
 
@@ -232,7 +536,7 @@ class RealEstateDataProcessor:
         )
 
         summary = (
-            f"Between {min(years)} and {max(years)}, {scope_text} recorded "
+            f"Between {first_year} and {last_year}, {scope_text} recorded "
             f"₹{total_sales:,.0f} in total sales with {property_sums.sum():,.0f} units sold. "
             f"Average prices per sq.ft (Flat/Office/Shop) were ₹{avg_flat_price:,.0f} / "
             f"₹{avg_office_price:,.0f} / ₹{avg_shop_price:,.0f}. "
@@ -254,27 +558,28 @@ class RealEstateDataProcessor:
         if df.empty:
             return {'labels': [], 'datasets': []}
 
-        yearly_data = df.groupby('year').agg({
-            'flat_weighted_avg_rate': 'mean',
-            'office_weighted_avg_rate': 'mean',
-            'shop_weighted_avg_rate': 'mean',
-            'total_sales': 'sum',
-            'total_sold': 'sum'
-        }).reset_index()
+        # Only the series that are charted are aggregated, in a single pass.
+        yearly_data = df.groupby('year', observed=True, sort=True, as_index=False).agg(
+            flat=('flat_weighted_avg_rate', 'mean'),
+            sold=('total_sold', 'sum'),
+        )
+        # Separate arrays so an integer 'sold' total stays integral in the JSON.
+        flat = yearly_data['flat'].to_numpy()
+        sold = yearly_data['sold'].to_numpy()
 
         return {
             'labels': yearly_data['year'].astype(int).tolist(),
             'datasets': [
                 {
                     'label': 'Avg Flat Price (₹/sq.ft)',
-                    'data': yearly_data['flat_weighted_avg_rate'].round(2).tolist(),
+                    'data': self._json_values(np.round(flat, 2)),
                     'borderColor': 'rgb(67, 97, 238)',
                     'tension': 0.2,
                     'yAxisID': 'y'
                 },
                 {
                     'label': 'Total Units Sold',
-                    'data': yearly_data['total_sold'].round(0).tolist(),
+                    'data': self._json_values(np.round(sold, 0)),
                     'type': 'bar',
                     'backgroundColor': 'rgba(230, 57, 70, 0.4)',
                     'borderColor': 'rgba(230, 57, 70, 1)',
@@ -283,6 +588,13 @@ class RealEstateDataProcessor:
             ]
         }
     
+    @staticmethod
+    def _json_values(values):
+        """Convert an array to a list with None for NaN, which JSON cannot store."""
+        if values.dtype.kind == 'f' and np.isnan(values).any():
+            return np.where(np.isnan(values), None, values).tolist()
+        return values.tolist()
+
     def prepare_table_data(self, df):
         """
         Prepare data for tabular display.
@@ -302,8 +614,9 @@ class RealEstateDataProcessor:
             'shop_weighted_avg_rate', 'others_weighted_avg_rate'
         ]
 
-        table_df = df[display_columns].copy()
-        table_df = table_df.rename(columns={
+        # Selecting a column list already returns a new frame; nothing here
+        # writes to it in place, so no extra copy is needed.
+        table_df = df[display_columns].rename(columns={
             'final_location': 'Location',
             'total_sales': 'Total Sales (₹)',
             'total_sold': 'Total Units Sold',
@@ -313,64 +626,187 @@ class RealEstateDataProcessor:
             'others_weighted_avg_rate': 'Others Avg Rate (₹/sq.ft)'
         })
 
-        numeric_cols = [col for col in table_df.columns if table_df[col].dtype != 'object']
-        for col in numeric_cols:
-            table_df[col] = table_df[col].round(2)
+        # DataFrame.round only touches numeric columns and leaves integers as is.
+        table_df = table_df.round(2)
 
-        return table_df.to_dict('records')
+        # Arrow builds the row dicts in C++; NaN cells come out as None.
+        return pa.Table.from_pandas(table_df, preserve_index=False).to_pylist()
     
-    def process_query(self, query, filters=None):
+    def extract_filters(self, query, filters=None):
         """
-        Process a natural language query and return analysis results.
+        Fill in filters that were not provided explicitly from the query text.
         
         Args:
             query (str): Natural language query
-            filters (dict, optional): Additional filters
+            filters (dict, optional): Explicit filters; updated in place
             
         Returns:
-            dict: Analysis results including summary, chart data, and table data
+            dict: The completed filters
         """
         if filters is None:
             filters = {}
         
+        query_lc = query.lower() if query else ''
+
         # Extract filters from query if not provided
         if not filters.get('locality') and query:
-            localities = self.df['final_location'].unique()
-            for loc in localities:
-                if loc.lower() in query.lower():
-                    filters['locality'] = loc
-                    break
+            locality = self._match_locality(query_lc)
+            if locality:
+                filters['locality'] = locality
         
         # Extract year range from query if not provided
         if not filters.get('year_range') and query:
             # Look for patterns like '2019-2023' or 'last 3 years'
-            year_match = re.search(r'(\d{4})\s*-\s*(\d{4})', query)
+            year_match = self.YEAR_RANGE_RE.search(query)
             if year_match:
                 filters['year_range'] = f"{year_match.group(1)}-{year_match.group(2)}"
             else:
-                last_years = re.search(r'last\s+(\d+)\s+years?', query.lower())
+                last_years = self.LAST_YEARS_RE.search(query)
                 if last_years:
                     filters['year_range'] = f"last {last_years.group(1)}"
         
         # Extract property type if not provided
         if not filters.get('property_type') and query:
             for prop in self.PROPERTY_COLUMNS:
-                if prop in query.lower():
+                if prop in query_lc:
                     filters['property_type'] = prop
                     break
+
+        return filters
+
+    @classmethod
+    def _build_locality_automaton(cls, localities_lc):
+        if ahocorasick is None or len(localities_lc) < cls.LOCALITY_AUTOMATON_MIN:
+            return None
+        automaton = ahocorasick.Automaton()
+        for position, (loc_lc, loc) in enumerate(localities_lc):
+            # Keep the first spelling, as the linear scan would.
+            if loc_lc and not automaton.exists(loc_lc):
+                automaton.add_word(loc_lc, (position, loc))
+        automaton.make_automaton()
+        return automaton
+
+    def _match_locality(self, query_lc):
+        """Return the first known locality (in sorted order) contained in the query."""
+        return match_locality(query_lc, self._localities_lc, self._locality_automaton)
+
+    def process_query(self, query, filters=None, table_limit=None):
+        """
+        Process a natural language query and return analysis results.
         
+        Args:
+            query (str): Natural language query
+            filters (dict, optional): Additional filters
+            table_limit (int, optional): Only include the first N table rows
+            
+        Returns:
+            dict: Analysis results including summary, chart data, and table data
+        """
+        if filters is None:
+            filters = {}
+
+        filters_key = tuple(sorted(filters.items()))
+        try:
+            hash(filters_key)
+        except TypeError:  # unhashable filter values; skip the cache
+            run_query = self._run_query
+        else:
+            run_query = self._query_cache
+
+        # Callers may mutate the result, so never hand out the cached objects.
+        result = copy.deepcopy(run_query(query, filters_key, table_limit))
+        # extract_filters fills in the caller's dict; keep doing so on cache hits.
+        filters.update(result['filters'])
+        result['filters'] = filters
+        return result
+
+    def _run_query(self, query, filters_key, table_limit):
+        filters = self.extract_filters(query, dict(filters_key))
+
         # Filter data based on extracted filters
         filtered_df = self.filter_data(filters)
         
         # Generate analysis
         summary = self.generate_summary(filtered_df, query)
         chart_data = self.prepare_chart_data(filtered_df)
-        table_data = self.prepare_table_data(filtered_df)
+        table_df = filtered_df if table_limit is None else filtered_df.head(table_limit)
+        table_data = self.prepare_table_data(table_df)
         
         return {
             'query': query,
             'summary': summary,
             'chart_data': chart_data,
             'table_data': table_data,
+            'table_total': len(filtered_df),
             'filters': filters
         }
+
+
+def match_locality(query_lc, localities_lc, automaton=None):
+    """Return the first locality in ``localities_lc`` whose lowercase name occurs in ``query_lc``.
+
+    ``localities_lc`` holds (lowercase, display) pairs in priority order. Both the
+    query serializer and the processor use this, so they resolve a query to the
+    same locality. ``automaton`` is an optional Aho-Corasick automaton built from
+    the same pairs by _build_locality_automaton.
+    """
+    if automaton is not None:
+        # One pass over the query finds every contained locality.
+        matches = [value for _, value in automaton.iter(query_lc)]
+        return min(matches)[1] if matches else None
+    for loc_lc, loc in localities_lc:
+        if loc_lc in query_lc:
+            return loc
+    return None
+
+
+def _data_version():
+    """Return a marker that changes whenever RealEstateData rows are imported or removed.
+
+    It is read from the database, so every process sees the same value.
+    """
+    try:
+        RealEstateData = apps.get_model('api', 'RealEstateData')
+        stats = RealEstateData.objects.aggregate(count=Count('id'), updated=Max('updated_at'))
+    except (LookupError, DatabaseError) as exc:
+        logger.warning("Unable to read the real estate data version: %s", exc)
+        return None
+    return stats['count'], stats['updated']
+
+
+def get_processor():
+    """Return the process-wide RealEstateDataProcessor, building it on first use.
+
+    The DataFrame is loaded once per process and shared by every request. At
+    most every PROCESSOR_VERSION_CHECK_INTERVAL seconds the database is checked
+    for a newer import; if there is one a new processor is built and swapped in,
+    so requests holding the old one keep a consistent view.
+    """
+    global _PROCESSOR_CHECKED_AT
+
+    processor = _PROCESSOR_SINGLETON
+    if processor is not None and time.monotonic() - _PROCESSOR_CHECKED_AT < PROCESSOR_VERSION_CHECK_INTERVAL:
+        return processor
+
+    version = _data_version()
+    if processor is not None and version == _PROCESSOR_DATA_VERSION:
+        _PROCESSOR_CHECKED_AT = time.monotonic()
+        return processor
+    return _replace_processor(version, stale=processor)
+
+
+def refresh_processor():
+    """Rebuild the shared processor from its source right away."""
+    return _replace_processor(_data_version(), stale=_PROCESSOR_SINGLETON)
+
+
+def _replace_processor(version, stale):
+    global _PROCESSOR_SINGLETON, _PROCESSOR_DATA_VERSION, _PROCESSOR_CHECKED_AT
+
+    with _PROCESSOR_LOCK:
+        # Another thread may have swapped it in while this one waited.
+        if _PROCESSOR_SINGLETON is stale:
+            _PROCESSOR_SINGLETON = RealEstateDataProcessor()
+            _PROCESSOR_DATA_VERSION = version
+        _PROCESSOR_CHECKED_AT = time.monotonic()
+        return _PROCESSOR_SINGLETON
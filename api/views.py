@@ -1,9 +1,15 @@
 import csv
 import io
 import logging
+from datetime import timedelta
 
+import pandas as pd
 from django.conf import settings
-from django.http import HttpResponse
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.db.models import F
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -14,15 +20,47 @@ try:
 except ImportError:  # pragma: no cover - optional dependency
     OpenAI = None
 
+from .models import CachedAnalysis, RealEstateData
+from .pagination import TableRowsPagination
 from .serializers.real_estate import (
     AnalysisQuerySerializer,
     AnalysisResultSerializer,
     ExportDataSerializer,
 )
-from .utils.data_processor import RealEstateDataProcessor
+from .utils import cache_keys
+from .utils.arrow import arrow_compatible
+from .utils.data_processor import get_processor
 
 logger = logging.getLogger(__name__)
 
+# Rows converted per chunk when streaming a CSV export.
+CSV_EXPORT_CHUNK_ROWS = 10_000
+
+# Seconds a CachedAnalysis row is served before it is recomputed (and pruned).
+CACHED_ANALYSIS_MAX_AGE = 60 * 60 * 24
+
+
+def _analysis_filters(data):
+    """Build the processor filters from validated AnalysisQuerySerializer data."""
+    return {
+        'locality': data.get('locality') or '',
+        'year_range': data.get('year_range', ''),
+        'property_type': data.get('property_type', ''),
+        'year_from': data.get('year_from'),
+        'year_to': data.get('year_to'),
+    }
+
+
+def _iter_csv(df, chunk_rows=CSV_EXPORT_CHUNK_ROWS):
+    """Yield ``df`` as CSV bytes, ``chunk_rows`` rows at a time, header first.
+
+    The bytes match a single ``df.to_csv(index=False)`` call.
+    """
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield chunk.to_csv(header=start == 0, index=False).encode('utf-8')
+
+
 class RealEstateAnalysisView(APIView):
     """
     API endpoint for real estate analysis.
@@ -32,7 +70,7 @@ class RealEstateAnalysisView(APIView):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         try:
-            self.processor = RealEstateDataProcessor()
+            self.processor = get_processor()
             self.ai_client = self._init_openai_client()
         except Exception as e:
             logger.error(f"Error initializing RealEstateDataProcessor: {str(e)}")
@@ -71,18 +109,27 @@ class RealEstateAnalysisView(APIView):
         ""
         try:
             query = data.get('query', '')
-            filters = {
-                'locality': data.get('locality') or '',
-                'year_range': data.get('year_range', ''),
-                'property_type': data.get('property_type', ''),
-                'year_from': data.get('year_from'),
-                'year_to': data.get('year_to'),
-            }
+            filters = _analysis_filters(data)
+
+            query_params = {'query': query.strip(), **filters}
+            # Keyed on the loaded data too, so edits and re-imports miss the cache.
+            query_hash = CachedAnalysis.hash_params(
+                {**query_params, 'data_version': self.processor.data_version}
+            )
+            cached_result = self._get_cached_result(query_hash)
+            if cached_result is not None:
+                return Response(cached_result, status=status.HTTP_200_OK)
 
-            result = self.processor.process_query(query, filters)
+            # Only the first page of table rows is inlined; the rest is served by
+            # AnalysisRowsView.
+            page_size = TableRowsPagination.default_limit
+            result = self.processor.process_query(query, filters, table_limit=page_size)
+            total_rows = result.pop('table_total')
             result['filters'] = filters
             result['metadata'] = {
-                'rows': len(result.get('table_data', [])),
+                'rows': total_rows,
+                'table_page_size': page_size,
+                'has_more_rows': total_rows > len(result['table_data']),
                 'generated_at': settings.TIME_ZONE,
             }
 
@@ -96,7 +143,8 @@ class RealEstateAnalysisView(APIView):
             response_serializer = AnalysisResultSerializer(data=result)
             if not response_serializer.is_valid():
                 logger.warning(f"Response validation failed: {response_serializer.errors}")
-            
+
+            self._store_cached_result(query_hash, query_params, result)
             return Response(result, status=status.HTTP_200_OK)
             
         except Exception as e:
@@ -106,6 +154,31 @@ class RealEstateAnalysisView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @staticmethod
+    def _cache_cutoff():
+        return timezone.now() - timedelta(seconds=CACHED_ANALYSIS_MAX_AGE)
+
+    def _get_cached_result(self, query_hash):
+        try:
+            cached = CachedAnalysis.objects.get(query_hash=query_hash, created_at__gte=self._cache_cutoff())
+        except CachedAnalysis.DoesNotExist:
+            return None
+
+        cached.access_count = F('access_count') + 1
+        cached.save(update_fields=['access_count', 'last_accessed'])
+        return cached.result
+
+    def _store_cached_result(self, query_hash, query_params, result):
+        try:
+            # Drop expired rows, including results for data versions no longer loaded.
+            CachedAnalysis.objects.filter(created_at__lt=self._cache_cutoff()).delete()
+            CachedAnalysis.objects.get_or_create(
+                query_hash=query_hash,
+                defaults={'query_params': query_params, 'result': result},
+            )
+        except (DatabaseError, TypeError, ValueError) as exc:
+            logger.warning("Unable to cache analysis result: %s", exc)
+
     def _init_openai_client(self):
         api_key = getattr(settings, 'OPENAI_API_KEY', '')
         if not api_key or OpenAI is None:
@@ -144,6 +217,42 @@ class RealEstateAnalysisView(APIView):
             return None
 
 
+class AnalysisRowsView(APIView):
+    """
+    API endpoint returning table rows for an analysis query, page by page.
+    """
+    permission_classes = [AllowAny]
+    pagination_class = TableRowsPagination
+
+    def get(self, request, format=None):
+        ""
+        # Accepts the same parameters as /api/analyze/ plus offset and limit.
+        # Example: /api/analyze/rows/?query=analyze%20Wakad&offset=40&limit=40
+        ""
+        serializer = AnalysisQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(
+                {"error": "Invalid query parameters", "details": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        data = serializer.validated_data
+        try:
+            processor = get_processor()
+            filters = processor.extract_filters(data.get('query', ''), _analysis_filters(data))
+            filtered_df = processor.filter_data(filters)
+
+            paginator = self.pagination_class()
+            page = paginator.paginate_dataframe(filtered_df, request)
+            return paginator.get_paginated_response(processor.prepare_table_data(page))
+        except Exception as e:
+            logger.error(f"Error retrieving analysis rows: {str(e)}", exc_info=True)
+            return Response(
+                {"error": "Failed to retrieve analysis rows"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class AvailableLocalitiesView(APIView):
     """
     API endpoint to get the list of available localities.
@@ -155,8 +264,21 @@ class AvailableLocalitiesView(APIView):
         #Return a list of unique localities in the dataset.
         ""
         try:
-            processor = RealEstateDataProcessor()
-            localities = sorted(processor.df['final_location'].unique().tolist())
+            localities = cache.get(cache_keys.AVAILABLE_LOCALITIES)
+            if localities is None:
+                localities = list(
+                    RealEstateData.objects.values_list('final_location', flat=True)
+                    .distinct()
+                    .order_by('final_location')
+                )
+                if not localities:
+                    # Nothing imported yet; fall back to the external dataset.
+                    localities = get_processor().unique_localities
+                cache.set(
+                    cache_keys.AVAILABLE_LOCALITIES,
+                    localities,
+                    cache_keys.AVAILABLE_LOCALITIES_TIMEOUT,
+                )
             return Response({"localities": localities}, status=status.HTTP_200_OK)
         except Exception as e:
             logger.error(f"Error getting localities: {str(e)}", exc_info=True)
@@ -209,7 +331,7 @@ class DataExportView(APIView):
         serializer = ExportDataSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        processor = RealEstateDataProcessor()
+        processor = get_processor()
         filters = {
             'locality': request.data.get('locality', ''),
             'year_range': request.data.get('year_range', ''),
@@ -225,17 +347,33 @@ class DataExportView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+        filtered_df = processor.with_extra_columns(filtered_df)
+
         export_format = serializer.validated_data['format']
         if export_format == 'excel':
             buffer = io.BytesIO()
-            filtered_df.to_excel(buffer, index=False)
+            # constant_memory flushes each row as it is written instead of
+            # keeping the whole workbook in memory.
+            with pd.ExcelWriter(
+                buffer, engine='xlsxwriter', engine_kwargs={'options': {'constant_memory': True}}
+            ) as writer:
+                filtered_df.to_excel(writer, index=False)
             content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
             filename = 'real_estate_export.xlsx'
+        elif export_format == 'parquet':
+            buffer = io.BytesIO()
+            arrow_compatible(filtered_df).to_parquet(
+                buffer, engine='pyarrow', compression='zstd', index=False
+            )
+            content_type = 'application/vnd.apache.parquet'
+            filename = 'real_estate_export.parquet'
         else:
-            buffer = io.StringIO()
-            filtered_df.to_csv(buffer, index=False)
-            content_type = 'text/csv'
-            filename = 'real_estate_export.csv'
+            # Stream CSV chunk by chunk instead of building the whole file in memory.
+            response = StreamingHttpResponse(
+                _iter_csv(filtered_df), content_type='text/csv'
+            )
+            response['Content-Disposition'] = 'attachment; filename="real_estate_export.csv"'
+            return response
 
         response = HttpResponse(buffer.getvalue(), content_type=content_type)
         response['Content-Disposition'] = f'attachment; filename="{filename}"'